@@ -0,0 +1,66 @@
+import pytest
+
+from trading_backoffice.loader.intraday_trade_loader import (
+    IntradayTradeLoader,
+    IntradayTradeLoadError,
+)
+
+
+class _FakeResp:
+    error = None
+
+
+class _FakeQuery:
+    def __init__(self, sink):
+        self.sink = sink
+
+    def insert(self, records):
+        self.sink.append(records)
+        return self
+
+    def execute(self):
+        return _FakeResp()
+
+
+class _FakeSupabase:
+    def __init__(self):
+        self.inserted = []
+
+    def table(self, name):
+        return _FakeQuery(self.inserted)
+
+
+def _make_loader(client):
+    return IntradayTradeLoader(
+        supabase_client=client,
+        config={"intraday_trades_table": "intraday_trades"},
+    )
+
+
+HEADER = ",".join(IntradayTradeLoader.CSV_TO_DB_COLS)
+
+DATA_ROW = (
+    "B1,SHEET,STRAT,NSE,FUTIDX,NIFTY,25-Sep-2026,,,"
+    "10,12.5,3,11.0,7,29-Aug-2026"
+)
+
+
+def test_header_only_file_raises_no_data_rows(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text(HEADER + "\n")
+
+    client = _FakeSupabase()
+    with pytest.raises(IntradayTradeLoadError, match="no data rows"):
+        _make_loader(client).load(str(path))
+
+    assert client.inserted == []
+
+
+def test_single_row_file_loads(tmp_path):
+    path = tmp_path / "one.csv"
+    path.write_text(HEADER + "\n" + DATA_ROW + "\n")
+
+    client = _FakeSupabase()
+    _make_loader(client).load(str(path))
+
+    assert sum(len(batch) for batch in client.inserted) == 1
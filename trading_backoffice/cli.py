@@ -16,18 +16,28 @@ def setup_logging() -> None:
     )
 
 
+_supabase_client = None
+
+
 def get_supabase_client():
-    load_dotenv()
+    # Memoized so multi-file loads in one process reuse a single
+    # client (and its connection pool) instead of re-authenticating.
+    global _supabase_client
 
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY")
+    if _supabase_client is None:
+        load_dotenv()
 
-    if not url or not key:
-        raise RuntimeError(
-            "SUPABASE_URL or SUPABASE_KEY not set. Check .env file."
-        )
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_KEY")
+
+        if not url or not key:
+            raise RuntimeError(
+                "SUPABASE_URL or SUPABASE_KEY not set. Check .env file."
+            )
+
+        _supabase_client = create_client(url, key)
 
-    return create_client(url, key)
+    return _supabase_client
 
 
 def main():
@@ -40,15 +50,15 @@ def main():
     load_parser = subparsers.add_parser("load", help="Load data into backoffice")
     load_sub = load_parser.add_subparsers(dest="target", required=True)
 
-    # backoffice load net <file>
+    # backoffice load net <file> [<file> ...]
     net_parser = load_sub.add_parser("net", help="Load net position snapshot")
-    net_parser.add_argument("csv_path")
+    net_parser.add_argument("csv_path", nargs="+")
 
-    # backoffice load intraday <file>
+    # backoffice load intraday <file> [<file> ...]
     intra_parser = load_sub.add_parser(
         "intraday", help="Load intraday trades"
     )
-    intra_parser.add_argument("csv_path")
+    intra_parser.add_argument("csv_path", nargs="+")
 
     args = parser.parse_args()
 
@@ -57,16 +67,26 @@ def main():
     if args.command == "load" and args.target == "net":
         loader = NetPositionSnapshotLoader(
             supabase_client=supabase,
-            config={"net_positions_table": "net_positions"},
+            config={
+                "net_positions_table": "net_positions",
+                # Optional: direct-Postgres COPY+merge path for upserts.
+                "db_dsn": os.getenv("SUPABASE_DB_URL"),
+            },
         )
-        loader.load(args.csv_path)
+        for path in args.csv_path:
+            loader.load(path)
 
     elif args.command == "load" and args.target == "intraday":
         loader = IntradayTradeLoader(
             supabase_client=supabase,
-            config={"intraday_trades_table": "intraday_trades"},
+            config={
+                "intraday_trades_table": "intraday_trades",
+                # Optional: direct-Postgres COPY path for bulk inserts.
+                "db_dsn": os.getenv("SUPABASE_DB_URL"),
+            },
         )
-        loader.load(args.csv_path)
+        for path in args.csv_path:
+            loader.load(path)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List
 
+import numpy as np
 import pandas as pd
 
+from trading_backoffice.loader.schema_cache import normalization_plan
+
 
 class IntradayTradeLoadError(Exception):
     pass
@@ -20,6 +24,8 @@ class IntradayTradeLoader:
     - Accepts raw broker data
     """
 
+    __slots__ = ("supabase", "table", "db_dsn", "logger")
+
     DATE_REGEX = re.compile(r"^\d{2}-[A-Za-z]{3}-\d{4}$")
 
     ALLOWED_EXCHANGES = {"NSE", "BSE"}
@@ -40,6 +46,12 @@ class IntradayTradeLoader:
         "BANKEX": {"BKX", "BKXOPT", "BANKEX"},
     }
 
+    BSE_ALIAS_TO_SYMBOL = {
+        alias: canonical
+        for canonical, aliases in BSE_SYMBOL_MAP.items()
+        for alias in aliases
+    }
+
     CSV_TO_DB_COLS = {
         "Broker_Id": "broker_id",
         "Sheet": "sheet",
@@ -59,11 +71,22 @@ class IntradayTradeLoader:
     }
 
     REQUIRED_COLUMNS = set(CSV_TO_DB_COLS.keys())
-    NULL_STRINGS = {"", "nan", "none", "null"}
+    NULL_STRINGS = frozenset({"", "nan", "none", "null"})
+
+    UPPERCASE_COLUMNS = (
+        "Broker_Id", "Sheet", "Strategy", "Exchange",
+        "Instrument", "Symbol", "Opt_Type",
+    )
+
+    BATCH_SIZE = 1000
+    CHUNK_SIZE = 50_000
 
     def __init__(self, supabase_client, config: Dict):
         self.supabase = supabase_client
         self.table = config["intraday_trades_table"]
+        # Optional direct-Postgres DSN; when set, batches go in via
+        # COPY instead of the PostgREST insert endpoint.
+        self.db_dsn = config.get("db_dsn")
         self.logger = logging.getLogger(
             "trading_backoffice.intraday_trade_loader"
         )
@@ -75,34 +98,81 @@ class IntradayTradeLoader:
     def load(self, csv_path: str) -> None:
         self.logger.info(f"File received: {csv_path}")
 
-        df = self._read_csv(csv_path)
-        self._validate_required_columns(df)
-        self._basic_normalization(df)
+        trade_date = None
+        total_rows = 0
 
-        trade_date = self._validate_trade_date(df)
-        self._validate_exchange(df)
+        # One uploader thread overlaps the previous chunk's DB insert
+        # (network-bound) with the next chunk's parse + validation
+        # (CPU-bound). A single in-flight chunk keeps inserts ordered
+        # and memory bounded.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = None
 
-        self._canonicalize_bse_symbols(df)
-        self._canonicalize_equity_instruments(df)
-        self._validate_expiry_strike_opt_type(df)
-        self._validate_quantities_and_rates(df)
+            for chunk_no, df in enumerate(self._read_csv_chunks(csv_path), 1):
+                if chunk_no == 1:
+                    self._validate_required_columns(df)
 
-        self.logger.info(
-            f"Inserting {len(df)} intraday rows for Trade_Date={trade_date}"
-        )
+                # A header-only file yields one empty chunk; skip it so
+                # the no-data-rows check below reports it properly.
+                if df.empty:
+                    continue
+
+                self._basic_normalization(df)
+
+                trade_date = self._validate_trade_date(df, expected=trade_date)
+
+                # Content validators collect rather than raise, so one
+                # run reports every problem in the chunk at once. The
+                # aggregation is per chunk: a failure here aborts the
+                # load, but chunks already handed to the uploader are
+                # in the table and are not rolled back (the streaming
+                # design's partial-upload tradeoff).
+                errors: List[str] = []
+                errors += self._validate_exchange(df)
+
+                self._canonicalize_bse_symbols(df)
+
+                # Instrument masks are computed once and shared: equity
+                # canonicalization only rewrites EQ-alias rows, so the
+                # FUT/OPT masks stay valid afterwards.
+                masks = self._instrument_masks(df)
+                self._canonicalize_equity_instruments(df, masks["eq"])
+                errors += self._validate_expiry_strike_opt_type(df, masks)
+                errors += self._validate_quantities_and_rates(df)
+
+                if errors:
+                    raise IntradayTradeLoadError("\n".join(errors))
+
+                records = self._to_db_records(df)
 
-        self._insert_to_db(self._to_db_records(df))
+                if pending is not None:
+                    pending.result()
+
+                self.logger.info(
+                    f"Inserting chunk {chunk_no} "
+                    f"({len(df)} rows) for Trade_Date={trade_date}"
+                )
+
+                pending = pool.submit(self._insert_to_db, records)
+                total_rows += len(df)
+
+            if pending is not None:
+                pending.result()
+
+        if trade_date is None:
+            raise IntradayTradeLoadError("File contains no data rows.")
 
         self.logger.info(
-            f"Intraday trades loaded successfully for Trade_Date={trade_date}"
+            f"Intraday trades loaded successfully: "
+            f"{total_rows} rows for Trade_Date={trade_date}"
         )
 
     # =====================================================
     # CSV
     # =====================================================
 
-    def _read_csv(self, path: str) -> pd.DataFrame:
-        return pd.read_csv(path, dtype=str)
+    def _read_csv_chunks(self, path: str):
+        return pd.read_csv(path, dtype=str, chunksize=self.CHUNK_SIZE)
 
     def _validate_required_columns(self, df: pd.DataFrame) -> None:
         missing = self.REQUIRED_COLUMNS - set(df.columns)
@@ -112,30 +182,37 @@ class IntradayTradeLoader:
             )
 
     def _basic_normalization(self, df: pd.DataFrame) -> None:
-        for col in df.columns:
-            df[col] = df[col].astype(str).str.strip()
+        strip_cols, upper_cols = normalization_plan(
+            tuple(df.columns), self.UPPERCASE_COLUMNS
+        )
 
-        for col in [
-            "Broker_Id", "Sheet", "Strategy", "Exchange",
-            "Instrument", "Symbol", "Opt_Type"
-        ]:
-            df[col] = df[col].str.upper()
+        # Columns are already str (dtype=str at read), so no astype copy.
+        df[list(strip_cols)] = df[list(strip_cols)].apply(
+            lambda s: s.str.strip()
+        )
+        df[list(upper_cols)] = df[list(upper_cols)].apply(
+            lambda s: s.str.upper()
+        )
 
     # =====================================================
     # DATE / EXCHANGE
     # =====================================================
 
-    def _validate_trade_date(self, df: pd.DataFrame) -> str:
-        dates = df["Trade_Date"].unique()
-        if len(dates) != 1:
+    def _validate_trade_date(
+        self, df: pd.DataFrame, expected: str | None = None
+    ) -> str:
+        first = expected if expected is not None else df["Trade_Date"].iat[0]
+        if (df["Trade_Date"] != first).any():
             raise IntradayTradeLoadError("Trade_Date must be unique per file.")
-        self._parse_date(dates[0], "Trade_Date")
-        return dates[0]
+        if expected is None:
+            self._parse_date(first, "Trade_Date")
+        return first
 
-    def _validate_exchange(self, df: pd.DataFrame) -> None:
-        bad = set(df["Exchange"]) - self.ALLOWED_EXCHANGES
-        if bad:
-            raise IntradayTradeLoadError(f"Invalid exchange(s): {bad}")
+    def _validate_exchange(self, df: pd.DataFrame) -> List[str]:
+        bad = ~df["Exchange"].isin(self.ALLOWED_EXCHANGES)
+        if bad.any():
+            return [f"Invalid exchange(s): {set(df.loc[bad, 'Exchange'])}"]
+        return []
 
     def _parse_date(self, value: str, col: str) -> None:
         if not self.DATE_REGEX.match(value):
@@ -149,82 +226,155 @@ class IntradayTradeLoader:
     # =====================================================
 
     def _canonicalize_bse_symbols(self, df: pd.DataFrame) -> None:
-        for canonical, aliases in self.BSE_SYMBOL_MAP.items():
-            mask = (df["Exchange"] == "BSE") & df["Symbol"].isin(aliases)
-            df.loc[mask, "Symbol"] = canonical
+        mask = (df["Exchange"] == "BSE") & df["Symbol"].isin(
+            self.BSE_ALIAS_TO_SYMBOL
+        )
+        if not mask.any():
+            return
+
+        df.loc[mask, "Symbol"] = df.loc[mask, "Symbol"].map(
+            self.BSE_ALIAS_TO_SYMBOL
+        )
 
-            opt = mask & df["Instrument"].isin({"IO", "OPT", "OPTIDX"})
-            fut = mask & df["Instrument"].isin({"FUT", "FUTIDX"})
+        opt = mask & df["Instrument"].isin({"IO", "OPT", "OPTIDX"})
+        fut = mask & df["Instrument"].isin({"FUT", "FUTIDX"})
 
-            df.loc[opt, "Instrument"] = "OPTIDX"
-            df.loc[fut, "Instrument"] = "FUTIDX"
+        df.loc[opt, "Instrument"] = "OPTIDX"
+        df.loc[fut, "Instrument"] = "FUTIDX"
+
+    def _canonicalize_equity_instruments(
+        self, df: pd.DataFrame, eq: pd.Series
+    ) -> None:
+        if not eq.any():
+            return
 
-    def _canonicalize_equity_instruments(self, df: pd.DataFrame) -> None:
-        eq = df["Instrument"].isin(self.EQ_ALIASES)
         df.loc[eq, "Instrument"] = "EQ"
-        df.loc[eq, ["Expiry", "Strike", "Opt_Type"]] = None
+
+        # mask() blanks the three contract columns in one aligned block
+        # write instead of a separate .loc write per column.
+        cols = ["Expiry", "Strike", "Opt_Type"]
+        df[cols] = df[cols].mask(eq)
 
     # =====================================================
     # CONTRACT VALIDATION
     # =====================================================
 
-    def _validate_expiry_strike_opt_type(self, df: pd.DataFrame) -> None:
-        for i, r in df.iterrows():
-            inst = r["Instrument"]
+    def _validate_expiry_strike_opt_type(
+        self, df: pd.DataFrame, masks: Dict[str, pd.Series]
+    ) -> List[str]:
+        errors: List[str] = []
 
-            if inst == "EQ":
-                continue
+        expiry_empty = self._empty_mask(df["Expiry"])
+        strike_empty = self._empty_mask(df["Strike"])
+        opt_empty = self._empty_mask(df["Opt_Type"])
 
-            if inst.startswith("FUT"):
-                if not r["Expiry"]:
-                    raise IntradayTradeLoadError(f"Row {i+1}: FUT needs expiry")
-                continue
+        bad_fut = masks["fut"] & expiry_empty
+        if bad_fut.any():
+            errors.append(
+                f"Row(s) {self._bad_rows(bad_fut)}: FUT needs expiry"
+            )
 
-            if inst.startswith("OPT"):
-                if not (r["Expiry"] and r["Strike"] and r["Opt_Type"]):
-                    raise IntradayTradeLoadError(
-                        f"Row {i+1}: OPT needs expiry/strike/opt_type"
-                    )
+        bad_opt = masks["opt"] & (
+            expiry_empty | strike_empty | opt_empty
+        )
+        if bad_opt.any():
+            errors.append(
+                f"Row(s) {self._bad_rows(bad_opt)}: "
+                "OPT needs expiry/strike/opt_type"
+            )
+
+        return errors
 
     # =====================================================
     # QUANTITIES / RATES (RELAXED & CORRECT)
     # =====================================================
 
-    def _validate_quantities_and_rates(self, df: pd.DataFrame) -> None:
-        for i, r in df.iterrows():
+    def _validate_quantities_and_rates(self, df: pd.DataFrame) -> List[str]:
+        errors: List[str] = []
+
+        # The arithmetic invariants run on raw ndarrays: no index
+        # alignment, just flat C loops over int64/float64 buffers.
+        try:
+            buy = self._to_int_series(df["Buy_Qty"]).to_numpy()
+            sell = self._to_int_series(df["Sell_Qty"]).to_numpy()
+            net = self._to_int_series(df["Net_Qty"]).to_numpy()
+        except IntradayTradeLoadError as exc:
+            return [str(exc)]
+
+        bad = (buy == 0) & (sell == 0)
+        if bad.any():
+            errors.append(
+                f"Row(s) {self._bad_rows_at(df.index, bad)}: "
+                "both Buy_Qty and Sell_Qty are zero"
+            )
 
-            def to_int(v):
-                if pd.isna(v) or str(v).lower() in self.NULL_STRINGS:
-                    return 0
-                return int(float(v))
+        bad = net != buy - sell
+        if bad.any():
+            errors.append(
+                f"Row(s) {self._bad_rows_at(df.index, bad)}: Net_Qty mismatch"
+            )
 
-            def to_float(v):
-                if pd.isna(v) or str(v).lower() in self.NULL_STRINGS:
-                    return None
-                return float(v)
+        try:
+            br = self._to_float_series(df["Buy_Rate"]).to_numpy()
+            sr = self._to_float_series(df["Sell_Rate"]).to_numpy()
+        except IntradayTradeLoadError as exc:
+            errors.append(str(exc))
+            return errors
+
+        bad = br < 0
+        if bad.any():
+            errors.append(
+                f"Row(s) {self._bad_rows_at(df.index, bad)}: Buy_Rate < 0"
+            )
 
-            buy = to_int(r["Buy_Qty"])
-            sell = to_int(r["Sell_Qty"])
-            net = to_int(r["Net_Qty"])
+        bad = sr < 0
+        if bad.any():
+            errors.append(
+                f"Row(s) {self._bad_rows_at(df.index, bad)}: Sell_Rate < 0"
+            )
 
-            if buy == 0 and sell == 0:
-                raise IntradayTradeLoadError(
-                    f"Row {i+1}: both Buy_Qty and Sell_Qty are zero"
-                )
+        return errors
 
-            if net != buy - sell:
-                raise IntradayTradeLoadError(
-                    f"Row {i+1}: Net_Qty mismatch"
-                )
+    # =====================================================
+    # VECTOR HELPERS
+    # =====================================================
 
-            br = to_float(r["Buy_Rate"])
-            sr = to_float(r["Sell_Rate"])
+    def _instrument_masks(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        inst = df["Instrument"]
+        return {
+            "eq": inst.isin(self.EQ_ALIASES),
+            "fut": inst.str.startswith("FUT"),
+            "opt": inst.str.startswith("OPT"),
+        }
+
+    def _empty_mask(self, s: pd.Series) -> pd.Series:
+        return s.isna() | s.str.lower().isin(self.NULL_STRINGS)
+
+    def _to_int_series(self, s: pd.Series) -> pd.Series:
+        filled = s.mask(self._empty_mask(s), "0")
+        try:
+            return pd.to_numeric(filled).astype("int64")
+        except (ValueError, TypeError) as exc:
+            raise IntradayTradeLoadError(
+                f"{s.name}: non-numeric value ({exc})"
+            ) from exc
+
+    def _to_float_series(self, s: pd.Series) -> pd.Series:
+        # Empty cells stay NaN so comparisons simply skip them.
+        try:
+            return pd.to_numeric(s.mask(self._empty_mask(s)))
+        except (ValueError, TypeError) as exc:
+            raise IntradayTradeLoadError(
+                f"{s.name}: non-numeric value ({exc})"
+            ) from exc
 
-            if br is not None and br < 0:
-                raise IntradayTradeLoadError(f"Row {i+1}: Buy_Rate < 0")
+    @staticmethod
+    def _bad_rows(mask: pd.Series) -> List[int]:
+        return [int(i) + 1 for i in mask[mask].index]
 
-            if sr is not None and sr < 0:
-                raise IntradayTradeLoadError(f"Row {i+1}: Sell_Rate < 0")
+    @staticmethod
+    def _bad_rows_at(index: pd.Index, bad: np.ndarray) -> List[int]:
+        return [int(index[p]) + 1 for p in np.flatnonzero(bad)]
 
     # =====================================================
     # DB
@@ -233,20 +383,59 @@ class IntradayTradeLoader:
     def _to_db_records(self, df: pd.DataFrame) -> List[dict]:
         db_df = df.rename(columns=self.CSV_TO_DB_COLS)
 
-        records = []
-        for rec in db_df.to_dict("records"):
-            clean = {}
-            for k, v in rec.items():
-                if pd.isna(v):
-                    clean[k] = None
-                else:
-                    clean[k] = v
-            records.append(clean)
+        # One column-level pass turns NaN into JSON-safe None before
+        # building the record dicts.
+        db_df = db_df.astype(object).where(db_df.notna(), None)
 
-        return records
+        return db_df.to_dict("records")
 
 
 
     def _insert_to_db(self, records: List[dict]) -> None:
-        self.supabase.table(self.table).insert(records).execute()
+        if self.db_dsn:
+            self._copy_to_db(records)
+            return
+
+        total = len(records)
+
+        for batch_no, start in enumerate(range(0, total, self.BATCH_SIZE), 1):
+            batch = records[start:start + self.BATCH_SIZE]
+
+            resp = self.supabase.table(self.table).insert(batch).execute()
+
+            if getattr(resp, "error", None):
+                raise IntradayTradeLoadError(
+                    f"Insert failed on batch {batch_no} "
+                    f"(rows {start + 1}-{start + len(batch)}): {resp.error}"
+                )
+
+            self.logger.info(
+                f"Inserted batch {batch_no} "
+                f"({start + len(batch)}/{total} rows)"
+            )
+
+    def _copy_to_db(self, records: List[dict]) -> None:
+        try:
+            import psycopg
+        except ImportError as exc:
+            raise IntradayTradeLoadError(
+                "db_dsn is configured but psycopg is not installed."
+            ) from exc
+
+        cols = list(self.CSV_TO_DB_COLS.values())
+
+        try:
+            with psycopg.connect(self.db_dsn) as conn:
+                with conn.cursor() as cur:
+                    with cur.copy(
+                        f"COPY {self.table} ({', '.join(cols)}) FROM STDIN"
+                    ) as copy:
+                        for rec in records:
+                            copy.write_row([rec[c] for c in cols])
+        except psycopg.Error as exc:
+            raise IntradayTradeLoadError(f"COPY failed: {exc}") from exc
+
+        self.logger.info(
+            f"COPY inserted {len(records)} rows into {self.table}"
+        )
 
@@ -5,6 +5,8 @@ from typing import Dict, List
 
 import pandas as pd
 
+from trading_backoffice.loader.schema_cache import normalization_plan
+
 
 class NetPositionLoadError(Exception):
     pass
@@ -20,6 +22,8 @@ class NetPositionSnapshotLoader:
     - DB upsert using business key
     """
 
+    __slots__ = ("supabase", "table", "db_dsn", "logger")
+
     DATE_REGEX = re.compile(r"^\d{2}-[A-Za-z]{3}-\d{4}$")
 
     ALLOWED_EXCHANGES = {"NSE", "BSE"}
@@ -41,6 +45,12 @@ class NetPositionSnapshotLoader:
         "BANKEX": {"BKX", "BKXOPT", "BANKEX"},
     }
 
+    BSE_ALIAS_TO_SYMBOL = {
+        alias: canonical
+        for canonical, aliases in BSE_SYMBOL_MAP.items()
+        for alias in aliases
+    }
+
     CSV_TO_DB_COLS = {
         "Broker_Id": "broker_id",
         "Sheet": "sheet",
@@ -57,10 +67,39 @@ class NetPositionSnapshotLoader:
     }
 
     REQUIRED_COLUMNS = set(CSV_TO_DB_COLS.keys())
+    NULL_STRINGS = frozenset({"", "nan", "none", "null"})
+
+    UPSERT_CONFLICT_KEYS = (
+        "broker_id",
+        "strategy",
+        "sheet",
+        "exchange",
+        "instrument_type",
+        "symbol",
+        "expiry",
+        "strike",
+        "opt_type",
+        "carry_date",
+    )
+
+    UPPERCASE_COLUMNS = (
+        "Broker_Id",
+        "Sheet",
+        "Strategy",
+        "Exchange",
+        "Instrument",
+        "Symbol",
+        "Opt_Type",
+    )
+
+    BATCH_SIZE = 1000
 
     def __init__(self, supabase_client, config: Dict):
         self.supabase = supabase_client
         self.table = config["net_positions_table"]
+        # Optional direct-Postgres DSN; when set, the snapshot goes in
+        # via COPY into a staging table plus one server-side merge.
+        self.db_dsn = config.get("db_dsn")
         self.logger = logging.getLogger(
             "trading_backoffice.net_position_loader"
         )
@@ -79,17 +118,29 @@ class NetPositionSnapshotLoader:
         self._basic_normalization(df)
 
         carry_date = self._validate_carry_date(df)
-        self._validate_exchange(df)
-        self._validate_expiry_format(df)
 
-        self.logger.info("File passed structural validation.")
+        # Content validators collect rather than raise, so one run
+        # reports every problem in the file at once.
+        errors: List[str] = []
+        errors += self._validate_exchange(df)
+
+        # The EQ-alias mask is shared: BSE canonicalization never moves
+        # a row into or out of the equity aliases.
+        eq_alias = df["Instrument"].isin(self.EQ_ALIASES)
+        errors += self._validate_expiry_format(df, eq_alias)
+
         self.logger.info("Normalizing symbols and instruments...")
 
-        self._canonicalize_bse_symbols(df)
-        self._canonicalize_equity_instruments(df)
+        errors += self._canonicalize_bse_symbols(df)
+        errors += self._canonicalize_equity_instruments(df, eq_alias)
 
         self.logger.info("Validating numeric fields...")
-        self._validate_numeric_fields(df)
+        errors += self._validate_numeric_fields(df)
+
+        if errors:
+            raise NetPositionLoadError("\n".join(errors))
+
+        self.logger.info("File passed structural validation.")
 
         self.logger.info("Resolving duplicate positions using snapshot rules...")
         df = self._merge_duplicates(df)
@@ -111,7 +162,12 @@ class NetPositionSnapshotLoader:
 
     def _read_csv(self, path: str) -> pd.DataFrame:
         try:
-            return pd.read_csv(path, dtype=str)
+            try:
+                # The multithreaded pyarrow engine is markedly faster
+                # on large files; pyarrow itself stays optional.
+                return pd.read_csv(path, dtype=str, engine="pyarrow")
+            except ImportError:
+                return pd.read_csv(path, dtype=str)
         except Exception as exc:
             raise NetPositionLoadError(f"Failed to read CSV: {exc}") from exc
 
@@ -123,60 +179,81 @@ class NetPositionSnapshotLoader:
             )
 
     def _basic_normalization(self, df: pd.DataFrame) -> None:
-        for col in df.columns:
-            df[col] = df[col].astype(str).str.strip()
+        strip_cols, upper_cols = normalization_plan(
+            tuple(df.columns), self.UPPERCASE_COLUMNS
+        )
 
-        for col in [
-            "Broker_Id",
-            "Sheet",
-            "Strategy",
-            "Exchange",
-            "Instrument",
-            "Symbol",
-            "Opt_Type",
-        ]:
-            df[col] = df[col].str.upper()
+        # Columns are already str (dtype=str at read), so no astype copy.
+        df[list(strip_cols)] = df[list(strip_cols)].apply(
+            lambda s: s.str.strip()
+        )
+        df[list(upper_cols)] = df[list(upper_cols)].apply(
+            lambda s: s.str.upper()
+        )
 
     # =====================================================
     # DATE / EXCHANGE VALIDATION
     # =====================================================
 
     def _validate_carry_date(self, df: pd.DataFrame) -> str:
-        vals = df["Carry_Date"].unique()
-        if len(vals) != 1:
+        if df.empty:
+            raise NetPositionLoadError(
+                "Carry_Date must be single-valued for entire file."
+            )
+
+        date_str = df["Carry_Date"].iat[0]
+        if (df["Carry_Date"] != date_str).any():
             raise NetPositionLoadError(
                 "Carry_Date must be single-valued for entire file."
             )
 
-        date_str = vals[0]
         self._parse_date(date_str, "Carry_Date")
         return date_str
 
-    def _validate_exchange(self, df: pd.DataFrame) -> None:
-        bad = set(df["Exchange"]) - self.ALLOWED_EXCHANGES
-        if bad:
-            raise NetPositionLoadError(
-                f"Invalid exchange(s): {bad}. Allowed: {self.ALLOWED_EXCHANGES}"
+    def _validate_exchange(self, df: pd.DataFrame) -> List[str]:
+        bad = ~df["Exchange"].isin(self.ALLOWED_EXCHANGES)
+        if bad.any():
+            return [
+                f"Invalid exchange(s): {set(df.loc[bad, 'Exchange'])}. "
+                f"Allowed: {self.ALLOWED_EXCHANGES}"
+            ]
+        return []
+
+    def _validate_expiry_format(
+        self, df: pd.DataFrame, eq: pd.Series
+    ) -> List[str]:
+        errors: List[str] = []
+
+        expiry_empty = self._empty_mask(df["Expiry"])
+
+        bad_eq = eq & ~expiry_empty
+        if bad_eq.any():
+            errors.append(
+                f"Row(s) {self._bad_rows(bad_eq)}: EQ must not have expiry."
             )
 
-    def _validate_expiry_format(self, df: pd.DataFrame) -> None:
-        for idx, row in df.iterrows():
-            inst = row["Instrument"]
-            expiry = row["Expiry"]
-
-            if inst in self.EQ_ALIASES:
-                if expiry and expiry != "nan":
-                    raise NetPositionLoadError(
-                        f"Row {idx+1}: EQ must not have expiry."
-                    )
-                continue
+        bad_missing = ~eq & expiry_empty
+        if bad_missing.any():
+            errors.append(
+                f"Row(s) {self._bad_rows(bad_missing)}: Missing expiry."
+            )
 
-            if not expiry or expiry == "nan":
-                raise NetPositionLoadError(
-                    f"Row {idx+1}: Missing expiry."
-                )
+        # cache=True memoizes repeated expiry strings, and the fixed
+        # format already enforces the DD-MMM-YYYY shape. Rows already
+        # flagged as missing are excluded so they are not double-counted.
+        expiry = df.loc[~eq & ~expiry_empty, "Expiry"]
+        parsed = pd.to_datetime(
+            expiry, format="%d-%b-%Y", errors="coerce", cache=True
+        )
+        bad_format = parsed.isna()
+        if bad_format.any():
+            bad_vals = expiry[bad_format].unique()
+            errors.append(
+                f"Row(s) {self._bad_rows(bad_format)} | Expiry: "
+                f"invalid date(s) {list(bad_vals)}. Expected DD-MMM-YYYY."
+            )
 
-            self._parse_date(expiry, "Expiry", idx)
+        return errors
 
     def _parse_date(
         self, value: str, col: str, idx: int | None = None
@@ -192,7 +269,7 @@ class NetPositionSnapshotLoader:
     # CANONICALIZATION
     # =====================================================
 
-    def _canonicalize_bse_symbols(self, df: pd.DataFrame) -> None:
+    def _canonicalize_bse_symbols(self, df: pd.DataFrame) -> List[str]:
         """
         BSE-only canonicalization.
 
@@ -205,68 +282,89 @@ class NetPositionSnapshotLoader:
         - FUT / FUTIDX      -> FUTIDX
         """
 
-        for canonical, aliases in self.BSE_SYMBOL_MAP.items():
-            mask = (df["Exchange"] == "BSE") & df["Symbol"].isin(aliases)
-
-            if not mask.any():
-                continue
+        mask = (df["Exchange"] == "BSE") & df["Symbol"].isin(
+            self.BSE_ALIAS_TO_SYMBOL
+        )
 
-            df.loc[mask, "Symbol"] = canonical
+        if not mask.any():
+            return []
 
-            opt_mask = mask & df["Instrument"].isin({"IO", "OPT", "OPTIDX"})
-            fut_mask = mask & df["Instrument"].isin({"FUT", "FUTIDX"})
+        errors: List[str] = []
 
-            df.loc[opt_mask, "Instrument"] = "OPTIDX"
-            df.loc[fut_mask, "Instrument"] = "FUTIDX"
+        bad_mask = mask & ~df["Instrument"].isin(
+            {"IO", "OPT", "OPTIDX", "FUT", "FUTIDX"}
+        )
 
-            bad_mask = mask & ~df["Instrument"].isin(
-                {"IO", "OPT", "OPTIDX", "FUT", "FUTIDX"}
+        if bad_mask.any():
+            bad_vals = df.loc[bad_mask, "Instrument"].unique()
+            errors.append(
+                f"BSE index instruments must be OPTIDX or FUTIDX. Found: {bad_vals}"
             )
 
-            if bad_mask.any():
-                bad_vals = df.loc[bad_mask, "Instrument"].unique()
-                raise NetPositionLoadError(
-                    f"BSE index instruments must be OPTIDX or FUTIDX. Found: {bad_vals}"
-                )
+        df.loc[mask, "Symbol"] = df.loc[mask, "Symbol"].map(
+            self.BSE_ALIAS_TO_SYMBOL
+        )
+
+        opt_mask = mask & df["Instrument"].isin({"IO", "OPT", "OPTIDX"})
+        fut_mask = mask & df["Instrument"].isin({"FUT", "FUTIDX"})
+
+        df.loc[opt_mask, "Instrument"] = "OPTIDX"
+        df.loc[fut_mask, "Instrument"] = "FUTIDX"
+
+        return errors
+
+    def _canonicalize_equity_instruments(
+        self, df: pd.DataFrame, eq_mask: pd.Series
+    ) -> List[str]:
+        if eq_mask.any():
+            df.loc[eq_mask, "Instrument"] = "EQ"
+            df.loc[eq_mask, "Sheet"] = "PORTFOLIO"
 
-    def _canonicalize_equity_instruments(self, df: pd.DataFrame) -> None:
-        eq_mask = df["Instrument"].isin(self.EQ_ALIASES)
-        df.loc[eq_mask, "Instrument"] = "EQ"
-        df.loc[eq_mask, "Sheet"] = "PORTFOLIO"
-        df.loc[eq_mask, ["Expiry", "Strike", "Opt_Type"]] = None
+            # mask() blanks the three contract columns in one aligned
+            # block write instead of a separate .loc write per column.
+            cols = ["Expiry", "Strike", "Opt_Type"]
+            df[cols] = df[cols].mask(eq_mask)
 
         bad = ~df["Instrument"].isin(self.ALLOWED_INSTRUMENTS)
         if bad.any():
-            raise NetPositionLoadError(
+            return [
                 f"Unknown instrument(s): {df.loc[bad, 'Instrument'].unique()}"
-            )
+            ]
+        return []
 
     # =====================================================
     # NUMERIC VALIDATION
     # =====================================================
 
-    def _validate_numeric_fields(self, df: pd.DataFrame) -> None:
-        for idx, row in df.iterrows():
-            try:
-                qty = int(row["Net_Qty"])
-            except Exception:
-                raise NetPositionLoadError(
-                    f"Row {idx+1}: Net_Qty must be integer."
-                )
+    def _validate_numeric_fields(self, df: pd.DataFrame) -> List[str]:
+        errors: List[str] = []
 
-            price = float(row["Avg_Price"])
-            if price < 0 or round(price, 3) != price:
-                raise NetPositionLoadError(
-                    f"Row {idx+1}: Avg_Price must be >=0 with 3 decimals."
-                )
+        bad = ~df["Net_Qty"].str.fullmatch(r"[+-]?\d+").fillna(False)
+        if bad.any():
+            errors.append(
+                f"Row(s) {self._bad_rows(bad)}: Net_Qty must be integer."
+            )
 
-            strike = row["Strike"]
-            if strike and strike != "nan":
-                val = float(strike)
-                if round(val, 3) != val:
-                    raise NetPositionLoadError(
-                        f"Row {idx+1}: Strike must be int or <=3 decimals."
-                    )
+        price = pd.to_numeric(df["Avg_Price"], errors="coerce")
+        bad = price.isna() | (price < 0) | (price.round(3) != price)
+        if bad.any():
+            errors.append(
+                f"Row(s) {self._bad_rows(bad)}: "
+                "Avg_Price must be >=0 with 3 decimals."
+            )
+
+        strike_present = ~self._empty_mask(df["Strike"])
+        strike = pd.to_numeric(
+            df["Strike"].where(strike_present), errors="coerce"
+        )
+        bad = strike_present & (strike.isna() | (strike.round(3) != strike))
+        if bad.any():
+            errors.append(
+                f"Row(s) {self._bad_rows(bad)}: "
+                "Strike must be int or <=3 decimals."
+            )
+
+        return errors
 
     # =====================================================
     # DUPLICATE SNAPSHOT MERGE
@@ -285,64 +383,96 @@ class NetPositionSnapshotLoader:
             "Opt_Type",
         ]
 
-        out: List[dict] = []
-        merged = 0
-
-        for _, g in df.groupby(keys, dropna=False):
-            if len(g) == 1:
-                out.append(g.iloc[0].to_dict())
-                continue
-
-            qty = g["Net_Qty"].astype(int).sum()
-            if qty == 0:
-                out.extend(g.to_dict("records"))
-                continue
+        qty = df["Net_Qty"].astype(int)
+        work = df.assign(
+            _qty=qty,
+            _notional=qty * df["Avg_Price"].astype(float),
+        )
 
-            vwap = (
-                (g["Net_Qty"].astype(int) * g["Avg_Price"].astype(float)).sum()
-                / qty
-            )
+        g = work.groupby(keys, dropna=False, sort=False)
+        group_qty = g["_qty"].transform("sum")
+        group_size = g["_qty"].transform("size")
 
-            row = g.iloc[0].to_dict()
-            row["Net_Qty"] = qty
-            row["Avg_Price"] = round(vwap, 3)
-            out.append(row)
-            merged += 1
+        # Singleton groups and zero-sum groups pass through untouched;
+        # everything else collapses to one VWAP row per group.
+        keep = (group_size == 1) | (group_qty == 0)
 
-        if merged:
-            self.logger.info(
-                f"Merged {merged} duplicate snapshot groups using VWAP."
-            )
-        else:
+        if keep.all():
             self.logger.info("No duplicate positions detected.")
+            return df
+
+        merged = (
+            work.loc[~keep]
+            .groupby(keys, dropna=False, sort=False, as_index=False)
+            .agg({
+                **{c: "first" for c in df.columns if c not in keys},
+                "_qty": "sum",
+                "_notional": "sum",
+            })
+        )
+        merged["Net_Qty"] = merged["_qty"]
+        merged["Avg_Price"] = (merged["_notional"] / merged["_qty"]).round(3)
 
-        return pd.DataFrame(out)
+        self.logger.info(
+            f"Merged {len(merged)} duplicate snapshot groups using VWAP."
+        )
+
+        return pd.concat(
+            [df.loc[keep], merged[list(df.columns)]], ignore_index=True
+        )
 
     # =====================================================
     # FINAL INVARIANTS
     # =====================================================
 
     def _final_shape_validation(self, df: pd.DataFrame) -> None:
-        for idx, row in df.iterrows():
-            inst = row["Instrument"]
+        inst = df["Instrument"]
 
-            if inst == "EQ":
-                if any([row["Expiry"], row["Strike"], row["Opt_Type"]]):
-                    raise NetPositionLoadError(
-                        f"Row {idx+1}: EQ must not have expiry/strike/opt_type."
-                    )
+        # Each null mask is computed once and reused by all three
+        # instrument checks.
+        expiry_empty = self._empty_mask(df["Expiry"])
+        strike_empty = self._empty_mask(df["Strike"])
+        opt_empty = self._empty_mask(df["Opt_Type"])
 
-            if inst in {"FUT", "FUTIDX", "FUTSTK"}:
-                if not row["Expiry"]:
-                    raise NetPositionLoadError(
-                        f"Row {idx+1}: FUT requires expiry."
-                    )
+        errors: List[str] = []
 
-            if inst in {"OPT", "OPTIDX", "OPTSTK"}:
-                if not (row["Expiry"] and row["Strike"] and row["Opt_Type"]):
-                    raise NetPositionLoadError(
-                        f"Row {idx+1}: OPT requires expiry, strike, opt_type."
-                    )
+        bad = (inst == "EQ") & ~(expiry_empty & strike_empty & opt_empty)
+        if bad.any():
+            errors.append(
+                f"Row(s) {self._bad_rows(bad)}: "
+                "EQ must not have expiry/strike/opt_type."
+            )
+
+        bad = inst.isin({"FUT", "FUTIDX", "FUTSTK"}) & expiry_empty
+        if bad.any():
+            errors.append(
+                f"Row(s) {self._bad_rows(bad)}: FUT requires expiry."
+            )
+
+        bad = inst.isin({"OPT", "OPTIDX", "OPTSTK"}) & (
+            expiry_empty | strike_empty | opt_empty
+        )
+        if bad.any():
+            errors.append(
+                f"Row(s) {self._bad_rows(bad)}: "
+                "OPT requires expiry, strike, opt_type."
+            )
+
+        if errors:
+            raise NetPositionLoadError("\n".join(errors))
+
+    # =====================================================
+    # VECTOR HELPERS
+    # =====================================================
+
+    def _empty_mask(self, s: pd.Series) -> pd.Series:
+        # astype(object) keeps this safe on post-merge frames where a
+        # column may hold a mix of strings and None.
+        return s.isna() | s.astype(object).str.lower().isin(self.NULL_STRINGS)
+
+    @staticmethod
+    def _bad_rows(mask: pd.Series) -> List[int]:
+        return [int(i) + 1 for i in mask[mask].index]
 
     # =====================================================
     # DB
@@ -350,22 +480,86 @@ class NetPositionSnapshotLoader:
 
     def _to_db_records(self, df: pd.DataFrame) -> List[dict]:
         db_df = df.rename(columns=self.CSV_TO_DB_COLS)
+
+        # One column-level pass turns NaN into JSON-safe None before
+        # building the record dicts.
+        db_df = db_df.astype(object).where(db_df.notna(), None)
+
         return db_df.to_dict(orient="records")
 
     def _upsert_to_db(self, records: List[dict]) -> None:
-        resp = (
-            self.supabase
-            .table(self.table)
-            .upsert(
-                records,
-                on_conflict=(
-                    "broker_id,strategy,sheet,exchange,"
-                    "instrument_type,symbol,expiry,strike,opt_type,carry_date"
-                ),
+        if self.db_dsn:
+            self._copy_upsert_to_db(records)
+            return
+
+        total = len(records)
+
+        for batch_no, start in enumerate(range(0, total, self.BATCH_SIZE), 1):
+            batch = records[start:start + self.BATCH_SIZE]
+
+            resp = (
+                self.supabase
+                .table(self.table)
+                .upsert(
+                    batch,
+                    on_conflict=",".join(self.UPSERT_CONFLICT_KEYS),
+                )
+                .execute()
             )
-            .execute()
-        )
 
-        if getattr(resp, "error", None):
-            raise NetPositionLoadError(resp.error)
+            if getattr(resp, "error", None):
+                raise NetPositionLoadError(
+                    f"Upsert failed on batch {batch_no} "
+                    f"(rows {start + 1}-{start + len(batch)}): {resp.error}"
+                )
+
+            self.logger.info(
+                f"Upserted batch {batch_no} "
+                f"({start + len(batch)}/{total} rows)"
+            )
+
+    def _copy_upsert_to_db(self, records: List[dict]) -> None:
+        try:
+            import psycopg
+        except ImportError as exc:
+            raise NetPositionLoadError(
+                "db_dsn is configured but psycopg is not installed."
+            ) from exc
+
+        cols = list(self.CSV_TO_DB_COLS.values())
+        update_cols = [c for c in cols if c not in self.UPSERT_CONFLICT_KEYS]
+
+        col_list = ", ".join(cols)
+        conflict = ", ".join(self.UPSERT_CONFLICT_KEYS)
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in update_cols)
+
+        try:
+            with psycopg.connect(self.db_dsn) as conn:
+                with conn.cursor() as cur:
+                    # COPY into a transaction-local staging table, then
+                    # merge server-side in one statement.
+                    cur.execute(
+                        f"CREATE TEMP TABLE _stage "
+                        f"(LIKE {self.table} INCLUDING DEFAULTS) "
+                        f"ON COMMIT DROP"
+                    )
+
+                    with cur.copy(
+                        f"COPY _stage ({col_list}) FROM STDIN"
+                    ) as copy:
+                        for rec in records:
+                            copy.write_row([rec[c] for c in cols])
+
+                    cur.execute(
+                        f"INSERT INTO {self.table} ({col_list}) "
+                        f"SELECT {col_list} FROM _stage "
+                        f"ON CONFLICT ({conflict}) "
+                        f"DO UPDATE SET {updates}"
+                    )
+        except psycopg.Error as exc:
+            raise NetPositionLoadError(f"COPY upsert failed: {exc}") from exc
+
+        self.logger.info(
+            f"COPY upserted {len(records)} rows into {self.table}"
+        )
 
@@ -0,0 +1,18 @@
+from functools import lru_cache
+from typing import Tuple
+
+
+@lru_cache(maxsize=32)
+def normalization_plan(
+    columns: Tuple[str, ...], upper_columns: Tuple[str, ...]
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Resolve, once per distinct CSV schema, which columns get stripped
+    and which of them additionally get uppercased.
+
+    Keyed on the column tuple, so the intraday loader's per-chunk calls
+    (same header every chunk) hit the cache instead of re-deriving the
+    plan.
+    """
+    upper_set = set(upper_columns)
+    return columns, tuple(c for c in columns if c in upper_set)